@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
-import json
 import argparse
 from src.parsers.cisco_parser import CiscoConfigParser
 from src.topology.topology_builder import TopologyBuilder
 from src.validation.validator import NetworkValidator
+from src.models.network_models import json_default
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def main():
     parser = argparse.ArgumentParser(description='Network Topology Analyzer - MVP')
@@ -49,8 +54,17 @@ def main():
     
     # Export topology
     print(f"\n4️⃣ Exporting topology to {args.output}...")
-    with open(args.output, 'w') as f:
-        json.dump(topology.to_dict(), f, indent=2)
+    with open(args.output, 'wb') as f:
+        if orjson is not None:
+            # Serialize straight from the model objects; dataclasses are routed through json_default
+            f.write(orjson.dumps(
+                {'devices': topology.devices, 'links': list(topology.links)},
+                default=json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+            ))
+        else:
+            for chunk in topology.iter_json_chunks():
+                f.write(chunk)
     print("   ✅ Export complete")
     
     # Summary
@@ -1,7 +1,12 @@
+from array import array
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Set, Optional, Tuple, ValuesView
 from enum import Enum
 import json
+import socket
+import struct
 
 class DeviceType(Enum):
     ROUTER = "router"
@@ -13,7 +18,67 @@ class Protocol(Enum):
     BGP = "bgp"
     STATIC = "static"
 
-@dataclass
+# Canonical, direction-independent link identity: sorted (device, interface) endpoints
+LinkKey = Tuple[Tuple[str, str], Tuple[str, str]]
+
+class _Sentinel(Enum):
+    # Marks a lazily computed attribute that has not been filled yet (None is a valid result).
+    # An Enum member pickles by reference, so identity survives the parser's process pool.
+    NOT_COMPUTED = 0
+
+_NOT_COMPUTED = _Sentinel.NOT_COMPUTED
+
+# Links handed back by NetworkTopology.release(), reused by Link.acquire().
+# Released topologies need not have been built from the pool, so it is capped.
+_LINK_POOL: List['Link'] = []
+_POOL_LIMIT = 4096
+
+def _return_to_pool(pool: list, items):
+    room = _POOL_LIMIT - len(pool)
+    if room > 0:
+        pool.extend(islice(items, room))
+
+# NetworkTopology.iface_flags bits
+IFACE_ADDRESSED = 1  # ip_address and subnet_mask are both configured
+IFACE_IP_VALID = 2   # iface_ip_int holds the parsed ip_address
+IFACE_MASK_VALID = 4 # iface_mask_int holds the parsed subnet_mask
+IFACE_OUT_OF_RANGE = 8  # mtu, vlan_id or bandwidth does not fit array('I'); read all three from the Interface
+IFACE_HAS_IP = 16    # ip_address is configured, whether or not it parsed
+
+def link_key(device1: str, interface1: str, device2: str, interface2: str) -> LinkKey:
+    """Return the direction-independent identity of a link between two endpoints"""
+    return tuple(sorted([(device1, interface1), (device2, interface2)]))
+
+def ipv4_to_int(address: str) -> int:
+    """Convert a dotted-quad IPv4 address to a 32-bit integer"""
+    return struct.unpack('!I', socket.inet_pton(socket.AF_INET, address))[0]
+
+def int_to_ipv4(value: int) -> str:
+    """Convert a 32-bit integer back to a dotted-quad IPv4 address"""
+    return socket.inet_ntop(socket.AF_INET, struct.pack('!I', value))
+
+@lru_cache(maxsize=None)
+def netmask_to_int(mask: str) -> int:
+    """Convert a subnet mask to a 32-bit netmask integer.
+    
+    Accepts the forms ipaddress.IPv4Network does after the '/': a prefix length,
+    a dotted-quad netmask, or a dotted-quad hostmask such as 0.0.0.255.
+    """
+    if mask.isascii() and mask.isdigit():
+        prefix = int(mask)
+        if prefix > 32:
+            raise ValueError(f"'{mask}' is not a valid netmask")
+        return ~(0xFFFFFFFF >> prefix) & 0xFFFFFFFF
+    mask_int = ipv4_to_int(mask)
+    host_bits = ~mask_int & 0xFFFFFFFF
+    if host_bits & (host_bits + 1):
+        # Not a netmask; try it as a hostmask, whose set bits are the host bits
+        host_bits = mask_int
+        if host_bits & (host_bits + 1):
+            raise ValueError(f"'{mask}' is not a valid netmask")
+    return ~host_bits & 0xFFFFFFFF
+
+@dataclass(slots=True)
 class Interface:
     name: str
     ip_address: Optional[str] = None
@@ -29,26 +94,53 @@ class Interface:
             # Simple implementation - you can enhance with ipaddress module
             return f"{self.ip_address}/{self.subnet_mask}"
         return None
+    
+    def to_dict(self) -> dict:
+        return {
+            'ip': self.ip_address,
+            'subnet_mask': self.subnet_mask,
+            'vlan': self.vlan_id,
+            'mtu': self.mtu,
+            'bandwidth': self.bandwidth
+        }
 
-@dataclass
+@dataclass(slots=True)
 class Device:
     name: str
     device_type: DeviceType
     interfaces: Dict[str, Interface] = field(default_factory=dict)
     routing_protocols: Set[Protocol] = field(default_factory=set)
     vlans: Dict[int, str] = field(default_factory=dict)  # vlan_id -> vlan_name
+    _mgmt_ip: object = field(default=_NOT_COMPUTED, init=False, repr=False, compare=False)
     
     def add_interface(self, interface: Interface):
         self.interfaces[interface.name] = interface
+        self._mgmt_ip = _NOT_COMPUTED
     
     def get_management_ip(self) -> Optional[str]:
         """Get the first available IP for management"""
-        for interface in self.interfaces.values():
-            if interface.ip_address:
-                return interface.ip_address
-        return None
+        if self._mgmt_ip is _NOT_COMPUTED:
+            self._mgmt_ip = None
+            for interface in self.interfaces.values():
+                if interface.ip_address:
+                    self._mgmt_ip = interface.ip_address
+                    break
+        return self._mgmt_ip
+    
+    def to_dict(self) -> dict:
+        return self._as_dict({iface_name: iface.to_dict() for iface_name, iface in self.interfaces.items()})
+    
+    def _as_dict(self, interfaces) -> dict:
+        """Export layout shared by to_dict() and json_default(); interfaces is passed in
+        either already serialized or as Interface objects for the encoder to handle"""
+        return {
+            'type': self.device_type.value,
+            'interfaces': interfaces,
+            'protocols': [p.value for p in self.routing_protocols],
+            'vlans': self.vlans
+        }
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class Link:
     device1: str
     interface1: str
@@ -56,57 +148,201 @@ class Link:
     interface2: str
     bandwidth: Optional[int] = None
     cost: int = 1
+    _key: LinkKey = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Make links bidirectional by sorting endpoints once, at construction
+        self._key = link_key(self.device1, self.interface1, self.device2, self.interface2)
+    
+    @classmethod
+    def acquire(cls, device1: str, interface1: str, device2: str, interface2: str,
+                bandwidth: Optional[int] = None, cost: int = 1) -> 'Link':
+        """Return a link, recycling a released instance when one is pooled"""
+        if not _LINK_POOL:
+            return cls(device1, interface1, device2, interface2, bandwidth, cost)
+        link = _LINK_POOL.pop()
+        link.device1 = device1
+        link.interface1 = interface1
+        link.device2 = device2
+        link.interface2 = interface2
+        link.bandwidth = bandwidth
+        link.cost = cost
+        link.__post_init__()
+        return link
     
     def __hash__(self):
-        # Make links bidirectional by sorting device names
-        devices = sorted([
-            (self.device1, self.interface1),
-            (self.device2, self.interface2)
-        ])
-        return hash(tuple(devices))
-
-@dataclass
+        return hash(self._key)
+    
+    def __eq__(self, other):
+        if not isinstance(other, Link):
+            return NotImplemented
+        return self._key == other._key
+    
+    def to_dict(self) -> dict:
+        return {
+            'device1': self.device1,
+            'interface1': self.interface1,
+            'device2': self.device2,
+            'interface2': self.interface2,
+            'bandwidth': self.bandwidth
+        }
+
+def json_default(obj):
+    """JSON encoder hook producing the to_dict() layout one object at a time.
+    
+    Nested objects are returned as-is so the encoder serializes them as it reaches
+    them, without building a full shadow dict tree first.
+    """
+    if isinstance(obj, Device):
+        return obj._as_dict(obj.interfaces)
+    if isinstance(obj, (Interface, Link)):
+        return obj.to_dict()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+@dataclass(slots=True)
 class NetworkTopology:
     devices: Dict[str, Device] = field(default_factory=dict)
-    links: Set[Link] = field(default_factory=set)
     subnets: Dict[str, List[str]] = field(default_factory=dict)  # subnet -> [device_names]
+    _links: Dict[LinkKey, Link] = field(default_factory=dict, init=False)
+    _neighbors: Optional[Dict[str, List[str]]] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Struct-of-arrays view of every interface, filled by index_interfaces().
+    # Device.interfaces stays the primary store; position i describes one interface.
+    iface_device: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    iface_name: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    iface_flags: bytearray = field(default_factory=bytearray, init=False, repr=False, compare=False)
+    iface_ip_int: array = field(default_factory=lambda: array('I'), init=False, repr=False, compare=False)
+    iface_mask_int: array = field(default_factory=lambda: array('I'), init=False, repr=False, compare=False)
+    iface_mtu: array = field(default_factory=lambda: array('I'), init=False, repr=False, compare=False)
+    iface_vlan: array = field(default_factory=lambda: array('I'), init=False, repr=False, compare=False)  # 0 = no VLAN
+    iface_bandwidth: array = field(default_factory=lambda: array('I'), init=False, repr=False, compare=False)  # 0 = unset
+    iface_index: Dict[Tuple[str, str], int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _index_stale: bool = field(default=True, init=False, repr=False, compare=False)
     
     def add_device(self, device: Device):
         self.devices[device.name] = device
+        self._index_stale = True
+    
+    @property
+    def links(self) -> ValuesView[Link]:
+        return self._links.values()
+    
+    def has_link(self, device1: str, interface1: str, device2: str, interface2: str) -> bool:
+        return link_key(device1, interface1, device2, interface2) in self._links
     
     def add_link(self, link: Link):
-        self.links.add(link)
+        self._links.setdefault(link._key, link)
+        self._neighbors = None
+    
+    def index_interfaces(self):
+        """Rebuild the iface_* arrays from the current devices, if they are stale.
+        
+        add_device() marks the index stale. Call invalidate_index() after changing
+        the interfaces of a device that was already added.
+        """
+        if not self._index_stale:
+            return
+        self._index_stale = False
+        self.iface_device = []
+        self.iface_name = []
+        self.iface_flags = bytearray()
+        self.iface_ip_int = array('I')
+        self.iface_mask_int = array('I')
+        self.iface_mtu = array('I')
+        self.iface_vlan = array('I')
+        self.iface_bandwidth = array('I')
+        self.iface_index = {}
+        
+        for device_name, device in self.devices.items():
+            for interface in device.interfaces.values():
+                flags = 0
+                ip_int = mask_int = 0
+                if interface.ip_address and interface.subnet_mask:
+                    flags |= IFACE_ADDRESSED
+                if interface.ip_address:
+                    flags |= IFACE_HAS_IP
+                    try:
+                        ip_int = ipv4_to_int(interface.ip_address)
+                        flags |= IFACE_IP_VALID
+                    except OSError:
+                        pass
+                if interface.subnet_mask:
+                    try:
+                        mask_int = netmask_to_int(interface.subnet_mask)
+                        flags |= IFACE_MASK_VALID
+                    except (OSError, ValueError):
+                        pass
+                
+                mtu, vlan, bandwidth = interface.mtu, interface.vlan_id or 0, interface.bandwidth or 0
+                if not (0 <= mtu <= 0xFFFFFFFF and 0 <= vlan <= 0xFFFFFFFF and 0 <= bandwidth <= 0xFFFFFFFF):
+                    # The Interface keeps the configured values; only the packed copy is dropped
+                    flags |= IFACE_OUT_OF_RANGE
+                    mtu = vlan = bandwidth = 0
+                
+                self.iface_index[(device_name, interface.name)] = len(self.iface_name)
+                self.iface_device.append(device_name)
+                self.iface_name.append(interface.name)
+                self.iface_flags.append(flags)
+                self.iface_ip_int.append(ip_int)
+                self.iface_mask_int.append(mask_int)
+                self.iface_mtu.append(mtu)
+                self.iface_vlan.append(vlan)
+                self.iface_bandwidth.append(bandwidth)
+    
+    def invalidate_index(self):
+        """Make the next index_interfaces() call rebuild the iface_* arrays"""
+        self._index_stale = True
+    
+    def interface_at(self, i: int) -> Interface:
+        """Return the Interface described by position i of the iface_* arrays"""
+        return self.devices[self.iface_device[i]].interfaces[self.iface_name[i]]
+    
+    def release(self):
+        """Hand links back to the allocation pool and empty the topology.
+        
+        The released links must not be used afterwards.
+        """
+        _return_to_pool(_LINK_POOL, self._links.values())
+        
+        self.devices.clear()
+        self.subnets.clear()
+        self._links.clear()
+        self._neighbors = None
+        self.invalidate_index()
+        self.index_interfaces()
     
     def get_neighbors(self, device_name: str) -> List[str]:
         """Get all neighboring devices"""
-        neighbors = []
-        for link in self.links:
-            if link.device1 == device_name:
-                neighbors.append(link.device2)
-            elif link.device2 == device_name:
-                neighbors.append(link.device1)
-        return neighbors
+        if self._neighbors is None:
+            # Built once on first lookup, invalidated by add_link
+            self._neighbors = {}
+            for link in self.links:
+                self._neighbors.setdefault(link.device1, []).append(link.device2)
+                if link.device2 != link.device1:
+                    self._neighbors.setdefault(link.device2, []).append(link.device1)
+        return list(self._neighbors.get(device_name, []))
     
     def to_dict(self) -> dict:
         """Serialize topology for JSON export"""
         return {
-            'devices': {name: {
-                'type': device.device_type.value,
-                'interfaces': {iface_name: {
-                    'ip': iface.ip_address,
-                    'subnet_mask': iface.subnet_mask,
-                    'vlan': iface.vlan_id,
-                    'mtu': iface.mtu,
-                    'bandwidth': iface.bandwidth
-                } for iface_name, iface in device.interfaces.items()},
-                'protocols': [p.value for p in device.routing_protocols],
-                'vlans': device.vlans
-            } for name, device in self.devices.items()},
-            'links': [{
-                'device1': link.device1,
-                'interface1': link.interface1,
-                'device2': link.device2,
-                'interface2': link.interface2,
-                'bandwidth': link.bandwidth
-            } for link in self.links]
+            'devices': {name: device.to_dict() for name, device in self.devices.items()},
+            'links': [link.to_dict() for link in self.links]
         }
+    
+    def iter_json_chunks(self) -> Iterator[bytes]:
+        """Yield the same document as to_dict() as compact JSON, one device/link at a time"""
+        encode = json.JSONEncoder(separators=(',', ':'), default=json_default).encode
+        
+        yield b'{"devices":{'
+        separator = ''
+        for name, device in self.devices.items():
+            yield f"{separator}{encode(name)}:{encode(device)}".encode()
+            separator = ','
+        yield b'},"links":['
+        separator = ''
+        for link in self.links:
+            yield f"{separator}{encode(link)}".encode()
+            separator = ','
+        yield b']}'
@@ -1,13 +1,59 @@
 import re
 import os
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
 from ..models.network_models import Device, Interface, DeviceType, Protocol
 
+# Start of every top-level configuration section
+_SECTION_START = re.compile(rb'(?m)^(?=[^\s!])')
+# Patterns are matched against lstripped lines, so they anchor at position 0
+_IFACE_RE = re.compile(r'interface\s+(\S+)')
+_VLAN_RE = re.compile(r'vlan\s+(\d+)')
+
+# Interface directive handlers, keyed on the directive's first word.
+# Each receives the interface and the remainder of the line.
+def _parse_ip(interface: Interface, rest: str):
+    parts = rest.split()
+    if len(parts) == 3 and parts[0] == 'address':
+        interface.ip_address = parts[1]
+        interface.subnet_mask = parts[2]
+
+def _parse_switchport(interface: Interface, rest: str):
+    parts = rest.split()
+    if len(parts) == 3 and parts[0] == 'access' and parts[1] == 'vlan' and parts[2].isdecimal():
+        interface.vlan_id = int(parts[2])
+
+def _parse_mtu(interface: Interface, rest: str):
+    value = rest.strip()
+    if value.isdecimal():
+        interface.mtu = int(value)
+
+def _parse_bw(interface: Interface, rest: str):
+    value = rest.strip()
+    if value.isdecimal():
+        interface.bandwidth = int(value)
+
+def _mark_down(interface: Interface, rest: str):
+    if not rest.strip():
+        interface.status = "down"
+
+def _parse_no(interface: Interface, rest: str):
+    if rest.strip() == 'shutdown':
+        interface.status = "up"
+
+def _noop(interface: Interface, rest: str):
+    pass
+
+_IFACE_DISPATCH = {
+    'ip': _parse_ip,
+    'switchport': _parse_switchport,
+    'mtu': _parse_mtu,
+    'bandwidth': _parse_bw,
+    'shutdown': _mark_down,
+    'no': _parse_no,
+}
+
 class CiscoConfigParser:
-    def __init__(self):
-        self.current_device = None
-        self.current_interface = None
-    
     def parse_config_file(self, file_path: str) -> Optional[Device]:
         """Parse a single Cisco config file"""
         if not os.path.exists(file_path):
@@ -16,31 +62,28 @@ class CiscoConfigParser:
         device_name = self._extract_device_name(file_path)
         device = Device(name=device_name, device_type=DeviceType.ROUTER)
         
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
+        with open(file_path, 'rb') as f:
+            data = f.read()
         
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+        # A section starts at every line whose first byte is neither whitespace nor '!'.
+        # One scan over the raw bytes finds them all, so blocks need no per-line end checks.
+        starts = [match.start() for match in _SECTION_START.finditer(data)]
+        for start, end in zip(starts, starts[1:] + [len(data)]):
+            section = data[start:end]
             
-            if line.startswith('interface '):
-                interface, next_i = self._parse_interface_block(lines, i)
+            if section.startswith(b'interface '):
+                interface = self._parse_interface_section(section)
                 if interface:
                     device.add_interface(interface)
-                i = next_i
-            elif line.startswith('router ospf'):
+            elif section.startswith(b'router ospf'):
                 device.routing_protocols.add(Protocol.OSPF)
-                i += 1
-            elif line.startswith('router bgp'):
+            elif section.startswith(b'router bgp'):
                 device.routing_protocols.add(Protocol.BGP)
-                i += 1
-            elif line.startswith('vlan '):
-                vlan_id, vlan_name = self._parse_vlan(line)
+            elif section.startswith(b'vlan '):
+                header = section.split(b'\n', 1)[0].decode('utf-8', 'replace').strip()
+                vlan_id, vlan_name = self._parse_vlan(header)
                 if vlan_id:
                     device.vlans[vlan_id] = vlan_name
-                i += 1
-            else:
-                i += 1
         
         return device
     
@@ -53,58 +96,31 @@ class CiscoConfigParser:
                 return part
         return "unknown_device"
     
-    def _parse_interface_block(self, lines: List[str], start_idx: int) -> Tuple[Optional[Interface], int]:
-        """Parse interface configuration block"""
-        line = lines[start_idx].strip()
+    def _parse_interface_section(self, section: bytes) -> Optional[Interface]:
+        """Parse an interface section (header line plus its indented body)"""
+        lines = section.decode('utf-8', 'replace').splitlines()
         
         # Extract interface name
-        match = re.match(r'interface\s+(\S+)', line)
+        match = _IFACE_RE.match(lines[0])
         if not match:
-            return None, start_idx + 1
+            return None
         
         interface_name = match.group(1)
         interface = Interface(name=interface_name)
         
-        i = start_idx + 1
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # End of interface block
-            if line and not line.startswith(' ') and not line.startswith('!'):
-                break
-            
-            # Parse IP address
-            ip_match = re.match(r'\s*ip address\s+(\S+)\s+(\S+)', line)
-            if ip_match:
-                interface.ip_address = ip_match.group(1)
-                interface.subnet_mask = ip_match.group(2)
-            
-            # Parse VLAN
-            vlan_match = re.match(r'\s*switchport access vlan\s+(\d+)', line)
-            if vlan_match:
-                interface.vlan_id = int(vlan_match.group(1))
-            
-            # Parse MTU
-            mtu_match = re.match(r'\s*mtu\s+(\d+)', line)
-            if mtu_match:
-                interface.mtu = int(mtu_match.group(1))
-            
-            # Parse bandwidth
-            bw_match = re.match(r'\s*bandwidth\s+(\d+)', line)
-            if bw_match:
-                interface.bandwidth = int(bw_match.group(1))
-            
-            # Check shutdown status
-            if 'shutdown' in line and not line.strip().startswith('no shutdown'):
-                interface.status = "down"
-            
-            i += 1
+        for line in lines[1:]:
+            # The first word fully identifies the directive
+            words = line.split(None, 1)
+            if words:
+                head = words[0]
+                rest = words[1] if len(words) > 1 else ''
+                _IFACE_DISPATCH.get(head, _noop)(interface, rest)
         
-        return interface, i
+        return interface
     
     def _parse_vlan(self, line: str) -> Tuple[Optional[int], str]:
         """Parse VLAN definition"""
-        match = re.match(r'vlan\s+(\d+)', line)
+        match = _VLAN_RE.match(line)
         if match:
             vlan_id = int(match.group(1))
             return vlan_id, f"VLAN_{vlan_id}"
@@ -113,13 +129,17 @@ class CiscoConfigParser:
     def parse_directory(self, config_dir: str) -> Dict[str, Device]:
         """Parse all config files in a directory"""
         devices = {}
+        file_paths = []
         
         for root, dirs, files in os.walk(config_dir):
             for file in files:
                 if file.endswith('.dump') or file.endswith('.cfg'):
-                    file_path = os.path.join(root, file)
-                    device = self.parse_config_file(file_path)
-                    if device:
-                        devices[device.name] = device
+                    file_paths.append(os.path.join(root, file))
+        
+        # Files are independent and parsing is CPU-bound, so fan out across processes
+        with ProcessPoolExecutor() as executor:
+            for device in executor.map(self.parse_config_file, file_paths, chunksize=8):
+                if device:
+                    devices[device.name] = device
         
         return devices
@@ -1,6 +1,8 @@
-import ipaddress
-from typing import Dict, List, Set
-from ..models.network_models import Device, Link, NetworkTopology, Interface
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+from ..models.network_models import (
+    Device, Link, NetworkTopology, Interface, IFACE_ADDRESSED, IFACE_IP_VALID, IFACE_MASK_VALID, IFACE_OUT_OF_RANGE
+)
 
 class TopologyBuilder:
     def __init__(self):
@@ -12,54 +14,59 @@ class TopologyBuilder:
         for device in devices.values():
             self.topology.add_device(device)
         
+        # Flatten interfaces into parallel arrays for the bulk scans below
+        self.topology.index_interfaces()
+        
         # Discover links based on IP subnets
-        self._discover_links(devices)
+        self._discover_links()
         
         # Build subnet mappings
         self._build_subnet_mappings(devices)
         
         return self.topology
     
-    def _discover_links(self, devices: Dict[str, Device]):
+    def _discover_links(self):
         """Discover links between devices based on shared subnets"""
-        subnet_to_devices = {}
+        topology = self.topology
+        valid = IFACE_IP_VALID | IFACE_MASK_VALID
+        subnet_to_interfaces: Dict[Tuple[int, int], List[int]] = defaultdict(list)
         
-        # Group interfaces by subnet
-        for device_name, device in devices.items():
-            for interface in device.interfaces.values():
-                if interface.ip_address and interface.subnet_mask:
-                    try:
-                        network = ipaddress.IPv4Network(
-                            f"{interface.ip_address}/{interface.subnet_mask}", 
-                            strict=False
-                        )
-                        subnet_str = str(network.network_address) + "/" + str(network.prefixlen)
-                        
-                        if subnet_str not in subnet_to_devices:
-                            subnet_to_devices[subnet_str] = []
-                        
-                        subnet_to_devices[subnet_str].append((device_name, interface))
-                    except Exception as e:
-                        print(f"Error parsing IP {interface.ip_address}/{interface.subnet_mask}: {e}")
+        # Group interface indices by (network, mask) straight from the packed arrays
+        for i, flags in enumerate(topology.iface_flags):
+            if not flags & IFACE_ADDRESSED:
+                continue
+            if (flags & valid) != valid:
+                interface = topology.interface_at(i)
+                reason = "invalid netmask" if flags & IFACE_IP_VALID else "invalid IP address"
+                print(f"Error parsing IP {interface.ip_address}/{interface.subnet_mask}: {reason}")
+                continue
+            mask = topology.iface_mask_int[i]
+            subnet_to_interfaces[(topology.iface_ip_int[i] & mask, mask)].append(i)
+        
+        def bandwidth(i: int) -> int:
+            if topology.iface_flags[i] & IFACE_OUT_OF_RANGE:
+                return topology.interface_at(i).bandwidth or 100
+            return topology.iface_bandwidth[i] or 100
         
         # Create links for devices in same subnet
-        for subnet, device_interfaces in subnet_to_devices.items():
-            if len(device_interfaces) >= 2:
+        for members in subnet_to_interfaces.values():
+            if len(members) >= 2:
                 # Create links between all pairs in the subnet
-                for i in range(len(device_interfaces)):
-                    for j in range(i + 1, len(device_interfaces)):
-                        device1_name, interface1 = device_interfaces[i]
-                        device2_name, interface2 = device_interfaces[j]
+                for a in range(len(members)):
+                    for b in range(a + 1, len(members)):
+                        i, j = members[a], members[b]
+                        device1, interface1 = topology.iface_device[i], topology.iface_name[i]
+                        device2, interface2 = topology.iface_device[j], topology.iface_name[j]
+                        # Check before acquiring, so a pooled Link is never taken for a duplicate
+                        if topology.has_link(device1, interface1, device2, interface2):
+                            continue
                         
-                        link = Link(
-                            device1=device1_name,
-                            interface1=interface1.name,
-                            device2=device2_name,
-                            interface2=interface2.name,
-                            bandwidth=min(
-                                interface1.bandwidth or 100,
-                                interface2.bandwidth or 100
-                            )
+                        link = Link.acquire(
+                            device1=device1,
+                            interface1=interface1,
+                            device2=device2,
+                            interface2=interface2,
+                            bandwidth=min(bandwidth(i), bandwidth(j))
                         )
                         self.topology.add_link(link)
     
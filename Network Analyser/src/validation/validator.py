@@ -1,44 +1,96 @@
-from typing import List, Dict, Set
-from collections import defaultdict
-import ipaddress
-from ..models.network_models import NetworkTopology, Device, Protocol
+from array import array
+from typing import List, Dict, Set, Tuple
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from ..models.network_models import (
+    NetworkTopology, Device, Protocol, IFACE_ADDRESSED, IFACE_HAS_IP, IFACE_IP_VALID, IFACE_MASK_VALID, IFACE_OUT_OF_RANGE,
+    int_to_ipv4
+)
 
 class NetworkValidator:
     def __init__(self, topology: NetworkTopology):
         self.topology = topology
         self.issues = []
+        self._adj: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._degree: Dict[str, int] = {}
     
     def validate_all(self) -> List[str]:
         """Run all validation checks"""
-        self.issues = []
+        # Index here rather than trusting the builder, so hand-built topologies and
+        # devices added after build_topology() are checked too. The topology only
+        # rebuilds the index when add_device() or invalidate_index() made it stale.
+        self.topology.index_interfaces()
+        self._build_adjacency()
+        
+        checks = [
+            self._check_duplicate_ips,
+            self._check_vlan_consistency,
+            self._check_gateway_addresses,
+            self._check_mtu_mismatches,
+            self._check_network_loops,
+            self._suggest_protocol_optimization,
+            self._suggest_node_aggregation,
+        ]
         
-        self._check_duplicate_ips()
-        self._check_vlan_consistency()
-        self._check_gateway_addresses()
-        self._check_mtu_mismatches()
-        self._check_network_loops()
-        self._suggest_protocol_optimization()
-        self._suggest_node_aggregation()
+        # Checks only read the topology, so they run side by side; each returns its
+        # own list and map() yields them in submission order, keeping the report stable
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda check: check(), checks))
         
+        self.issues = [issue for result in results for issue in result]
         return self.issues
     
-    def _check_duplicate_ips(self):
+    def _build_adjacency(self):
+        """Map each device to its (neighbor, local_iface, remote_iface) links and link count"""
+        self._adj = defaultdict(list)
+        self._degree = defaultdict(int)
+        for link in self.topology.links:
+            self._adj[link.device1].append((link.device2, link.interface1, link.interface2))
+            self._degree[link.device1] += 1
+            # A link between two interfaces of one device is a single neighbor entry
+            if link.device2 != link.device1:
+                self._adj[link.device2].append((link.device1, link.interface2, link.interface1))
+                self._degree[link.device2] += 1
+    
+    def _check_duplicate_ips(self) -> List[str]:
         """Check for duplicate IP addresses within same VLAN/subnet"""
-        ip_to_devices = defaultdict(list)
+        issues = []
+        topology = self.topology
+        ip_ints, vlans = topology.iface_ip_int, topology.iface_vlan
         
-        for device_name, device in self.topology.devices.items():
-            for interface in device.interfaces.values():
-                if interface.ip_address:
-                    key = f"{interface.ip_address}_{interface.vlan_id or 'no_vlan'}"
-                    ip_to_devices[key].append(f"{device_name}:{interface.name}")
-        
-        for ip_vlan, device_list in ip_to_devices.items():
-            if len(device_list) > 1:
-                ip = ip_vlan.split('_')[0]
-                self.issues.append(f"Duplicate IP {ip} found on: {', '.join(device_list)}")
+        # Pack (vlan, ip) into a single int key so counting needs no tuples or strings.
+        # The address takes the low 32 bits, so any VLAN value packs without collisions.
+        # Addresses that do not parse fall back to a (raw string, vlan) key.
+        candidates = []
+        keys = []
+        for i, flags in enumerate(topology.iface_flags):
+            if flags & IFACE_IP_VALID:
+                vlan = (topology.interface_at(i).vlan_id or 0) if flags & IFACE_OUT_OF_RANGE else vlans[i]
+                candidates.append(i)
+                keys.append(vlan << 32 | ip_ints[i])
+            elif flags & IFACE_HAS_IP:
+                interface = topology.interface_at(i)
+                candidates.append(i)
+                keys.append((interface.ip_address, interface.vlan_id or 0))
+        duplicated = {key for key, count in Counter(keys).items() if count > 1}
+        if not duplicated:
+            return issues
+        
+        ip_to_interfaces = defaultdict(list)
+        for i, key in zip(candidates, keys):
+            if key in duplicated:
+                ip_to_interfaces[key].append(i)
+        
+        for key, members in ip_to_interfaces.items():
+            device_list = [f"{topology.iface_device[i]}:{topology.iface_name[i]}" for i in members]
+            ip = int_to_ipv4(key & 0xFFFFFFFF) if isinstance(key, int) else key[0]
+            issues.append(f"Duplicate IP {ip} found on: {', '.join(device_list)}")
+        
+        return issues
     
-    def _check_vlan_consistency(self):
+    def _check_vlan_consistency(self) -> List[str]:
         """Check VLAN label consistency"""
+        issues = []
         vlan_names = defaultdict(set)
         
         for device in self.topology.devices.values():
@@ -47,72 +99,112 @@ class NetworkValidator:
         
         for vlan_id, names in vlan_names.items():
             if len(names) > 1:
-                self.issues.append(f"VLAN {vlan_id} has inconsistent names: {', '.join(names)}")
+                issues.append(f"VLAN {vlan_id} has inconsistent names: {', '.join(names)}")
+        
+        return issues
     
-    def _check_gateway_addresses(self):
+    def _check_gateway_addresses(self) -> List[str]:
         """Check for incorrect gateway addresses"""
-        for device_name, device in self.topology.devices.items():
-            for interface in device.interfaces.values():
-                if interface.ip_address and interface.subnet_mask:
-                    try:
-                        network = ipaddress.IPv4Network(
-                            f"{interface.ip_address}/{interface.subnet_mask}", 
-                            strict=False
-                        )
-                        
-                        # Check if IP is network or broadcast address
-                        ip_addr = ipaddress.IPv4Address(interface.ip_address)
-                        if ip_addr == network.network_address:
-                            self.issues.append(f"Device {device_name}:{interface.name} using network address as IP")
-                        elif ip_addr == network.broadcast_address:
-                            self.issues.append(f"Device {device_name}:{interface.name} using broadcast address as IP")
-                            
-                    except Exception:
-                        self.issues.append(f"Invalid IP/subnet on {device_name}:{interface.name}")
+        issues = []
+        topology = self.topology
+        valid = IFACE_IP_VALID | IFACE_MASK_VALID
+        
+        for i, flags in enumerate(topology.iface_flags):
+            if not flags & IFACE_ADDRESSED:
+                continue
+            name = f"{topology.iface_device[i]}:{topology.iface_name[i]}"
+            if (flags & valid) != valid:
+                issues.append(f"Invalid IP/subnet on {name}")
+                continue
+            
+            # Check if IP is network or broadcast address
+            ip_int = topology.iface_ip_int[i]
+            mask = topology.iface_mask_int[i]
+            network = ip_int & mask
+            if ip_int == network:
+                issues.append(f"Device {name} using network address as IP")
+            elif ip_int == network | (~mask & 0xFFFFFFFF):
+                issues.append(f"Device {name} using broadcast address as IP")
+        
+        return issues
     
-    def _check_mtu_mismatches(self):
+    def _check_mtu_mismatches(self) -> List[str]:
         """Check for MTU mismatches on connected interfaces"""
-        for link in self.topology.links:
-            device1 = self.topology.devices[link.device1]
-            device2 = self.topology.devices[link.device2]
-            
-            interface1 = device1.interfaces.get(link.interface1)
-            interface2 = device2.interfaces.get(link.interface2)
+        issues = []
+        topology = self.topology
+        
+        for link in topology.links:
+            i = topology.iface_index.get((link.device1, link.interface1))
+            j = topology.iface_index.get((link.device2, link.interface2))
             
-            if interface1 and interface2:
-                if interface1.mtu != interface2.mtu:
-                    self.issues.append(
-                        f"MTU mismatch between {link.device1}:{link.interface1} ({interface1.mtu}) "
-                        f"and {link.device2}:{link.interface2} ({interface2.mtu})"
+            if i is not None and j is not None:
+                if (topology.iface_flags[i] | topology.iface_flags[j]) & IFACE_OUT_OF_RANGE:
+                    mtu1, mtu2 = topology.interface_at(i).mtu, topology.interface_at(j).mtu
+                else:
+                    mtu1, mtu2 = topology.iface_mtu[i], topology.iface_mtu[j]
+                if mtu1 != mtu2:
+                    issues.append(
+                        f"MTU mismatch between {link.device1}:{link.interface1} ({mtu1}) "
+                        f"and {link.device2}:{link.interface2} ({mtu2})"
                     )
+        
+        return issues
     
-    def _check_network_loops(self):
-        """Simple loop detection using DFS"""
-        visited = set()
-        rec_stack = set()
-        
-        def has_cycle(device, path):
-            visited.add(device)
-            rec_stack.add(device)
-            
-            for neighbor in self.topology.get_neighbors(device):
-                if neighbor not in visited:
-                    if has_cycle(neighbor, path + [neighbor]):
-                        return True
-                elif neighbor in rec_stack:
-                    cycle_path = path[path.index(neighbor):] + [neighbor]
-                    self.issues.append(f"Potential loop detected: {' -> '.join(cycle_path)}")
-                    return True
+    def _check_network_loops(self) -> List[str]:
+        """Loop detection using an iterative DFS over an index-based adjacency list"""
+        issues = []
+        names = list(self.topology.devices)
+        n = len(names)
+        idx = {name: i for i, name in enumerate(names)}
+        adj: List[List[int]] = [
+            [idx[neighbor] for neighbor, _, _ in self._adj.get(name, []) if neighbor in idx]
+            for name in names
+        ]
+        
+        WHITE, GRAY, BLACK = 0, 1, 2
+        color = bytearray(n)
+        parent = array('i', [-1] * n)
+        # Links are undirected: the first edge back to the parent is the one we
+        # arrived on, any further one is a parallel link and therefore a loop
+        parent_edge_seen = bytearray(n)
+        
+        for root in range(n):
+            if color[root] != WHITE:
+                continue
+            color[root] = GRAY
+            stack = [(root, iter(adj[root]))]
             
-            rec_stack.remove(device)
-            return False
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if neighbor == parent[node] and not parent_edge_seen[node]:
+                        parent_edge_seen[node] = 1
+                        continue
+                    if color[neighbor] == WHITE:
+                        color[neighbor] = GRAY
+                        parent[neighbor] = node
+                        stack.append((neighbor, iter(adj[neighbor])))
+                        break
+                    if color[neighbor] == GRAY:
+                        cycle = [node]
+                        while cycle[-1] != neighbor:
+                            cycle.append(parent[cycle[-1]])
+                        cycle_path = [names[i] for i in reversed(cycle)] + [names[neighbor]]
+                        issues.append(f"Potential loop detected: {' -> '.join(cycle_path)}")
+                        # Report one loop per search tree, as before
+                        for frame_node, _ in stack:
+                            color[frame_node] = BLACK
+                        stack.clear()
+                        break
+                else:
+                    color[node] = BLACK
+                    stack.pop()
         
-        for device_name in self.topology.devices:
-            if device_name not in visited:
-                has_cycle(device_name, [device_name])
+        return issues
     
-    def _suggest_protocol_optimization(self):
+    def _suggest_protocol_optimization(self) -> List[str]:
         """Suggest BGP vs OSPF based on network size"""
+        issues = []
         total_devices = len(self.topology.devices)
         total_links = len(self.topology.links)
         
@@ -121,20 +213,25 @@ class NetworkValidator:
             ospf_devices = [name for name, device in self.topology.devices.items() 
                           if Protocol.OSPF in device.routing_protocols]
             if ospf_devices:
-                self.issues.append(
+                issues.append(
                     f"Consider using BGP instead of OSPF for large network. "
                     f"OSPF devices: {', '.join(ospf_devices[:5])}{'...' if len(ospf_devices) > 5 else ''}"
                 )
+        
+        return issues
     
-    def _suggest_node_aggregation(self):
+    def _suggest_node_aggregation(self) -> List[str]:
         """Suggest opportunities for node aggregation"""
+        issues = []
         # Find devices with only 2 connections (potential aggregation candidates)
         for device_name, device in self.topology.devices.items():
-            neighbors = self.topology.get_neighbors(device_name)
-            if len(neighbors) == 2:
+            if self._degree.get(device_name, 0) == 2:
+                neighbors = [neighbor for neighbor, _, _ in self._adj[device_name]]
                 active_interfaces = [iface for iface in device.interfaces.values() 
                                    if iface.status == "up" and iface.ip_address]
                 if len(active_interfaces) <= 2:
-                    self.issues.append(
+                    issues.append(
                         f"Device {device_name} might be aggregated with neighbors: {', '.join(neighbors)}"
                     )
+        
+        return issues